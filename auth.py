@@ -1,10 +1,16 @@
 import os
 import requests
+from requests.adapters import HTTPAdapter, Retry
 from dotenv import load_dotenv
+import threading
 import time
 
 load_dotenv()  # Load environment variables
 
+# Shared session so the TLS connection to Strava is reused between calls
+_session = requests.Session()
+_session.mount("https://", HTTPAdapter(pool_maxsize=2, max_retries=Retry(total=3, backoff_factor=0.5)))
+
 # Retrieve initial values from .env
 client_id = os.getenv("client_id")
 client_secret = os.getenv("client_secret")
@@ -27,38 +33,66 @@ def refresh_access_token():
     }
 
     # Make the POST request to refresh the token
-    response = requests.post(url, data=payload)
+    response = _session.post(url, data=payload, timeout=5)
     if response.status_code == 200:
         token_data = response.json()
         access_token = token_data["access_token"]
         refresh_token = token_data["refresh_token"]
         expires_at = token_data["expires_at"]
         
-        # Update the .env file with new tokens
-        update_env_file("access_token", access_token)
-        update_env_file("refresh_token", refresh_token)
-        update_env_file("expires_at", str(expires_at))
+        # Update the .env file with new tokens in one write
+        update_env_file({
+            "access_token": access_token,
+            "refresh_token": refresh_token,
+            "expires_at": str(expires_at),
+        })
         print(response.json())
         print("Access token refreshed.")
     else:
         raise Exception("Failed to refresh token: ", response.text)
 
-# Update .env file with new token values
-def update_env_file(key, value):
+# Update .env file with new token values (single read/rewrite for all keys)
+def update_env_file(updates):
     with open(".env", "r") as file:
         lines = file.readlines()
+    remaining = dict(updates)
+    for i, line in enumerate(lines):
+        key = line.split("=", 1)[0]
+        if key in remaining:
+            lines[i] = f"{key}={remaining.pop(key)}\n"
+    for key, value in remaining.items():
+        lines.append(f"{key}={value}\n")
     with open(".env", "w") as file:
-        for line in lines:
-            if line.startswith(f"{key}="):
-                file.write(f"{key}={value}\n")
-            else:
-                file.write(line)
+        file.writelines(lines)
+
+# Refresh ahead of expiry so callers rarely have to wait on the POST
+REFRESH_MARGIN = 300  # seconds before expiry to start refreshing
+
+_refresh_lock = threading.Lock()
+_refreshing = threading.Event()
+
+
+def _refresh_in_background():
+    try:
+        with _refresh_lock:
+            if time.time() > expires_at - REFRESH_MARGIN:
+                refresh_access_token()
+    finally:
+        _refreshing.clear()
+
 
 # Get a valid token (refresh if needed)
 def get_access_token():
-    global expires_at
-    if time.time() > expires_at - 300:
-        refresh_access_token()
+    now = time.time()
+    if now > expires_at:
+        # Token already expired: refresh on this thread before returning
+        with _refresh_lock:
+            if time.time() > expires_at:
+                refresh_access_token()
+    elif now > expires_at - REFRESH_MARGIN and not _refreshing.is_set():
+        # Still valid but close to expiry: refresh in the background
+        _refreshing.set()
+        threading.Thread(target=_refresh_in_background, daemon=True).start()
     return access_token
 
 
@@ -80,7 +114,7 @@ def fetch_segment_data(segment_id):
         "key_by_type": "true"
     }
 
-    response = requests.get(url, headers=headers, params=params)
+    response = _session.get(url, headers=headers, params=params, timeout=10)
     
     if response.status_code == 200:
         # Return the parsed JSON data, which includes 'latlng' and 'altitude' keys
@@ -2,49 +2,76 @@ import pandas as pd
 import numpy as np
 
 
+def haversine_distance(lat1, lon1, lat2, lon2, radius=6371000.0):
+    lat1, lon1, lat2, lon2 = map(np.radians, [lat1, lon1, lat2, lon2])
+    dlat = lat2 - lat1
+    dlon = lon2 - lon1
+    a = np.sin(dlat / 2)**2 + np.cos(lat1) * np.cos(lat2) * np.sin(dlon / 2)**2
+    return 2 * radius * np.arcsin(np.sqrt(a))
+
+
 def calculate_bearing(lat1, lon1, lat2, lon2):
     lat1, lon1, lat2, lon2 = map(np.radians, [lat1, lon1, lat2, lon2])
     dlon = lon2 - lon1
-    x = np.sin(dlon) * np.cos(lat2)
-    y = np.cos(lat1) * np.sin(lat2) - np.sin(lat1) * np.cos(lat2) * np.cos(dlon)
-    initial_bearing = np.arctan2(x, y)
-    initial_bearing = np.degrees(initial_bearing)
-    compass_bearing = (initial_bearing + 360) % 360
-    return compass_bearing
-
-# Function to convert bearing to cardinal direction
+    cos_lat2 = np.cos(lat2)
+    x = np.sin(dlon) * cos_lat2
+    y = np.cos(lat1) * np.sin(lat2) - np.sin(lat1) * cos_lat2 * np.cos(dlon)
+    return np.mod(np.degrees(np.arctan2(x, y)) + 360, 360)
+
+CARDINAL_DIRECTIONS = np.array(['N', 'NNE', 'NE', 'ENE', 'E', 'ESE', 'SE', 'SSE', 'S', 'SSW', 'SW', 'WSW', 'W', 'WNW', 'NW', 'NNW'])
+
+# Function to convert bearing(s) to cardinal direction; accepts scalars or arrays
 def bearing_to_cardinal(bearing):
-    directions = ['N', 'NNE', 'NE', 'ENE', 'E', 'ESE', 'SE', 'SSE', 'S', 'SSW', 'SW', 'WSW', 'W', 'WNW', 'NW', 'NNW']
-    idx = int((bearing + 11.25) / 22.5)
-    return directions[idx % 16]
+    idx = ((np.asarray(bearing) + 11.25) / 22.5).astype(np.int64) % 16
+    return CARDINAL_DIRECTIONS[idx]
 
 
 def process_segment(df):
-    df["lat"] = df["lat"].astype(float)
-    df["lon"] = df["lon"].astype(float)
-    df["altitude"] = df["altitude"].astype(float)
-    #calculate the net distance between a pair of lat/lon points
-    df["delta_lat"] = df["lat"].diff()
-    df["delta_lon"] = df["lon"].diff()
-    df["distance"] = (df["delta_lat"]**2 + df["delta_lon"]**2)**0.5
-    df["distance"] = df["distance"].fillna(0)
-    #convert the lat/lon distance to meters
-    df["distance"] = df["distance"] * 111139
-    #calculate the cumulative distance
-    df["cumulative_distance"] = df["distance"].cumsum()
+    if df.empty:
+        return df
+    #do all the derived-column math in one numpy pass instead of chained pandas ops
+    lat = df["lat"].to_numpy(dtype=np.float64)
+    lon = df["lon"].to_numpy(dtype=np.float64)
+    altitude = df["altitude"].to_numpy(dtype=np.float64)
+    delta_lat = np.diff(lat, prepend=lat[0])
+    delta_lon = np.diff(lon, prepend=lon[0])
+    #great-circle distance in meters between consecutive points
+    distance = np.zeros_like(lat)
+    distance[1:] = haversine_distance(lat[:-1], lon[:-1], lat[1:], lon[1:])
     #calculate the gradient between two points
-    df["delta_altitude"] = df["altitude"].diff()
-    df["gradient"] = (df["delta_altitude"] / df["distance"]) * 100
-    df["gradient"] = df["gradient"].fillna(0)
-    return df
+    delta_altitude = np.diff(altitude, prepend=altitude[0])
+    gradient = np.divide(
+        delta_altitude, distance,
+        out=np.zeros_like(distance), where=distance > 0,
+    ) * 100
+    return df.assign(
+        lat=lat,
+        lon=lon,
+        altitude=altitude,
+        delta_lat=delta_lat,
+        delta_lon=delta_lon,
+        distance=distance,
+        #calculate the cumulative distance
+        cumulative_distance=np.cumsum(distance),
+        delta_altitude=delta_altitude,
+        gradient=gradient,
+    )
 
 def smooth_data(df_col, window_size=5):
-    return (
-        df_col
-        .rolling(window=window_size, center=True)
-        .mean()
-        .fillna(method='bfill')  # Fill the start of the DataFrame
-        .fillna(method='ffill')  # Fill the end of the DataFrame
-    )
+    arr = np.asarray(df_col, dtype=np.float64)
+    if arr.size < window_size:
+        # Too short for a full window; same all-NaN result as rolling().mean()
+        return pd.Series(np.full(arr.size, np.nan), index=df_col.index)
+    kernel = np.full(window_size, 1.0 / window_size)
+    smoothed = np.convolve(arr, kernel, mode='valid')
+    #pad the edges with the nearest valid mean (replaces the bfill/ffill passes)
+    pad_left = window_size // 2
+    pad_right = window_size - 1 - pad_left
+    out = np.concatenate((
+        np.full(pad_left, smoothed[0]),
+        smoothed,
+        np.full(pad_right, smoothed[-1]),
+    ))
+    return pd.Series(out, index=df_col.index)
 
 
@@ -7,10 +7,22 @@ from auth import fetch_segment_data
 from data_proc_helper import *
 from visualizations import *
 
-@st.cache_data
+# Segment streams are immutable, so persist them to disk and skip the API
+# round-trip entirely on app restarts
+@st.cache_data(persist="disk")
 def cached_fetch_segment_data(segment_id):
     return fetch_segment_data(segment_id)
 
+# Pure transforms of the fetched data: memoize so widget tweaks that don't
+# change the segment skip the rebuild
+@st.cache_data
+def cached_process_segment(df):
+    return process_segment(df)
+
+@st.cache_data
+def cached_altitude_plot(df):
+    return plot_cumulative_distance_vs_altitude(df)
+
 # Sidebar input for segment ID
 st.sidebar.header("Segment Data")
 segment_id = st.sidebar.text_input("Enter Segment ID", "1555983")  # Example segment ID input
@@ -32,7 +44,7 @@ if segment_data:
         # Create a DataFrame with latitude, longitude, and altitude
         df = pd.DataFrame(latlng_data, columns=["lat", "lon"])
         df["altitude"] = altitude_data  
-        df = process_segment(df)
+        df = cached_process_segment(df)
         
 
         col1, col2 = st.columns(2)
@@ -43,7 +55,7 @@ if segment_data:
 
         with col2:
             st.write("Cumulative Distance vs Altitude")
-            fig = plot_cumulative_distance_vs_altitude(df)
+            fig = cached_altitude_plot(df)
             st.plotly_chart(fig)
         df.to_csv('data_sample.csv', index=False)
     else:
@@ -1,24 +1,31 @@
 import matplotlib.pyplot as plt
-from matplotlib.colors import Normalize, to_rgba
+import numpy as np
 import pydeck as pdk
 import plotly.express as px
 
+# Build the viridis lookup table once at import; the hot path is then pure numpy
+VIRIDIS_LUT = plt.get_cmap("viridis")(np.linspace(0, 1, 256))
+
 def altitude_colormap(df):
-    norm = Normalize(vmin=df["altitude"].min(), vmax=df["altitude"].max())
-    cmap = plt.get_cmap("viridis")
-    return [to_rgba(cmap(norm(alt))) for alt in df["altitude"]]
+    altitude = df["altitude"].to_numpy(dtype=np.float64)
+    span = altitude.max() - altitude.min()
+    if span == 0:
+        idx = np.zeros(altitude.size, dtype=np.uint8)
+    else:
+        idx = ((altitude - altitude.min()) / span * 255).astype(np.uint8)
+    #index the 256-entry colormap LUT in one gather instead of a per-row cmap call
+    return VIRIDIS_LUT.take(idx, axis=0)
 
 # Function to create a pydeck map
 def create_map(df):
-    df["color"] = altitude_colormap(df)
-
-    # Convert RGBA values to a format that pydeck can understand
-    df["color"] = df["color"].apply(lambda x: [int(255 * c) for c in x])
+    # Scale RGBA to 0-255 in one multiply+cast; lists only at the pydeck boundary.
+    # Attach the colors on a shallow copy so the caller's frame stays untouched.
+    colors = (altitude_colormap(df) * 255).astype(np.uint8).tolist()
 
     # Create a pydeck layer
     layer = pdk.Layer(
         'ScatterplotLayer',
-        data=df,
+        data=df.assign(color=colors),
         get_position='[lon, lat]',
         get_color='color',
         get_radius=50,
@@ -37,13 +44,12 @@ def create_map(df):
     return pdk.Deck(layers=[layer], initial_view_state=view_state)
 
 def plot_cumulative_distance_vs_altitude(df):
-    df['cumulative_distance'] = df['cumulative_distance'] / 1000  # Convert to kilometers
+    distance_km = df['cumulative_distance'].to_numpy() / 1000  # Convert to kilometers
     fig = px.line(
-        df,
-        x='cumulative_distance',
-        y='altitude',
+        x=distance_km,
+        y=df['altitude'],
         #title='Cumulative Distance vs Altitude',
-        labels={'cumulative_distance': 'Distance (km)', 'altitude': 'Altitude (m)'},
+        labels={'x': 'Distance (km)', 'y': 'Altitude (m)'},
         template='plotly_dark'  # Use the dark theme
     )
     return fig
\ No newline at end of file